@@ -1,6 +1,7 @@
 """Benchmark: pyfs_watcher.hash vs hashlib"""
 
 import hashlib
+import mmap
 import os
 import sys
 import tempfile
@@ -11,11 +12,22 @@ import pyfs_watcher
 
 
 def create_test_files(directory: str, count: int, size: int) -> list[str]:
+    # Allocate instead of writing: the hashers don't care what the bytes are.
+    # The index stamped into the first 8 bytes keeps every digest distinct.
     paths = []
     for i in range(count):
         path = os.path.join(directory, f"file_{i}.bin")
-        with open(path, "wb") as f:
-            f.write(os.urandom(size))
+        fd = os.open(
+            path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644
+        )
+        try:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, size)
+            else:
+                os.ftruncate(fd, size)
+            os.write(fd, i.to_bytes(8, "little"))
+        finally:
+            os.close(fd)
         paths.append(path)
     return paths
 
@@ -24,9 +36,10 @@ def bench_hashlib(paths: list[str]):
     start = time.perf_counter()
     for path in paths:
         h = hashlib.sha256()
-        with open(path, "rb") as f:
-            while chunk := f.read(1_048_576):
-                h.update(chunk)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            h.update(mm)
         h.hexdigest()
     elapsed = time.perf_counter() - start
     return elapsed
@@ -46,10 +59,31 @@ def bench_pyfs_watcher_blake3(paths: list[str]):
     return elapsed
 
 
+def bench_pyfs_watcher_blake3_mmap(paths: list[str]):
+    start = time.perf_counter()
+    pyfs_watcher.hash_files(paths, algorithm="blake3", mmap_rayon=True)
+    elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def bench_pyfs_watcher_blake3_into(paths: list[str]):
+    out = bytearray(len(paths) * 32)
+    start = time.perf_counter()
+    pyfs_watcher.hash_files_into(paths, out, algorithm="blake3")
+    elapsed = time.perf_counter() - start
+    return elapsed
+
+
 if __name__ == "__main__":
     count = 50
     size = 10 * 1024 * 1024  # 10 MB each
 
+    features = pyfs_watcher.cpu_features()
+    print(f"CPU features: {', '.join(features) or 'none detected'}")
+    # Without hardware SHA the comparison is portable sha2 vs OpenSSL, not like-for-like
+    # Only x86 SHA-NI is used by the sha2 build; ARM "sha2" stays portable
+    sha_backend = "SHA-NI" if "sha_ni" in features else "portable"
+
     with tempfile.TemporaryDirectory() as tmpdir:
         print(f"Creating {count} files of {size // 1024 // 1024} MB each...\n")
         paths = create_test_files(tmpdir, count, size)
@@ -61,11 +95,31 @@ if __name__ == "__main__":
 
         time_sha256 = bench_pyfs_watcher_sha256(paths)
         sha256_mbs = total_mb / time_sha256
-        print(f"pyfs_watcher (SHA256, parallel):     {time_sha256:.3f}s ({sha256_mbs:.0f} MB/s)")
+        print(
+            f"pyfs_watcher (SHA256, parallel, {sha_backend}): "
+            f"{time_sha256:.3f}s ({sha256_mbs:.0f} MB/s)"
+        )
 
         time_blake3 = bench_pyfs_watcher_blake3(paths)
         blake3_mbs = total_mb / time_blake3
         print(f"pyfs_watcher (BLAKE3, parallel):     {time_blake3:.3f}s ({blake3_mbs:.0f} MB/s)")
 
-        print(f"\nSpeedup SHA256 (parallel vs seq): {time_hashlib / time_sha256:.1f}x")
+        time_blake3_mmap = bench_pyfs_watcher_blake3_mmap(paths)
+        blake3_mmap_mbs = total_mb / time_blake3_mmap
+        print(
+            f"pyfs_watcher (BLAKE3, mmap_rayon):   {time_blake3_mmap:.3f}s "
+            f"({blake3_mmap_mbs:.0f} MB/s)"
+        )
+
+        time_blake3_into = bench_pyfs_watcher_blake3_into(paths)
+        blake3_into_mbs = total_mb / time_blake3_into
+        print(
+            f"pyfs_watcher (BLAKE3, into buffer): {time_blake3_into:.3f}s "
+            f"({blake3_into_mbs:.0f} MB/s)"
+        )
+
+        print(
+            f"\nSpeedup SHA256 (parallel vs seq, {sha_backend}): {time_hashlib / time_sha256:.1f}x"
+        )
         print(f"Speedup BLAKE3 vs hashlib SHA256: {time_hashlib / time_blake3:.1f}x")
+        print(f"Speedup BLAKE3 mmap vs hashlib SHA256: {time_hashlib / time_blake3_mmap:.1f}x")
@@ -24,6 +24,13 @@ def bench_pyfs_watcher_collect():
     return len(entries), elapsed
 
 
+def bench_pyfs_watcher_columns():
+    start = time.perf_counter()
+    paths, _depths, _sizes, _flags = pyfs_watcher.walk_collect_columns(TARGET, file_type="file")
+    elapsed = time.perf_counter() - start
+    return len(paths), elapsed
+
+
 def bench_pyfs_watcher_iter():
     start = time.perf_counter()
     count = sum(1 for _ in pyfs_watcher.walk(TARGET, file_type="file"))
@@ -31,6 +38,20 @@ def bench_pyfs_watcher_iter():
     return count, elapsed
 
 
+def bench_pyfs_watcher_batches():
+    start = time.perf_counter()
+    count = sum(len(batch) for batch in pyfs_watcher.walk_batches(TARGET, file_type="file"))
+    elapsed = time.perf_counter() - start
+    return count, elapsed
+
+
+def bench_pyfs_watcher_count():
+    start = time.perf_counter()
+    count = pyfs_watcher.walk_count(TARGET, file_type="file")
+    elapsed = time.perf_counter() - start
+    return count, elapsed
+
+
 if __name__ == "__main__":
     print(f"Benchmarking recursive walk of {TARGET}\n")
 
@@ -40,8 +61,20 @@ if __name__ == "__main__":
     count_collect, time_collect = bench_pyfs_watcher_collect()
     print(f"pyfs_watcher.walk_collect: {count_collect:>8,} files in {time_collect:.3f}s")
 
+    count_columns, time_columns = bench_pyfs_watcher_columns()
+    print(f"pyfs_watcher.walk_collect_columns: {count_columns:>8,} files in {time_columns:.3f}s")
+
     count_iter, time_iter = bench_pyfs_watcher_iter()
     print(f"pyfs_watcher.walk (iter): {count_iter:>8,} files in {time_iter:.3f}s")
 
+    count_batches, time_batches = bench_pyfs_watcher_batches()
+    print(f"pyfs_watcher.walk_batches: {count_batches:>8,} files in {time_batches:.3f}s")
+
+    count_native, time_native = bench_pyfs_watcher_count()
+    print(f"pyfs_watcher.walk_count: {count_native:>8,} files in {time_native:.3f}s")
+
     print(f"\nSpeedup (collect): {time_os / time_collect:.1f}x")
+    print(f"Speedup (columns): {time_os / time_columns:.1f}x")
     print(f"Speedup (iter):    {time_os / time_iter:.1f}x")
+    print(f"Speedup (batches): {time_os / time_batches:.1f}x")
+    print(f"Speedup (count):   {time_os / time_native:.1f}x")
@@ -4,11 +4,13 @@ from pyfs_watcher._core import (
     FileWatcher,
     bulk_rename,
     copy_files,
+    cpu_features,
     diff_dirs,
     disk_usage,
     find_duplicates,
     hash_file,
     hash_files,
+    hash_files_into,
     move_files,
     search,
     search_iter,
@@ -16,7 +18,10 @@ from pyfs_watcher._core import (
     sync,
     verify,
     walk,
+    walk_batches,
     walk_collect,
+    walk_collect_columns,
+    walk_count,
 )
 from pyfs_watcher.watch import async_watch
 
@@ -25,11 +30,13 @@ __all__ = [
     "async_watch",
     "bulk_rename",
     "copy_files",
+    "cpu_features",
     "diff_dirs",
     "disk_usage",
     "find_duplicates",
     "hash_file",
     "hash_files",
+    "hash_files_into",
     "move_files",
     "search",
     "search_iter",
@@ -37,5 +44,8 @@ __all__ = [
     "sync",
     "verify",
     "walk",
+    "walk_batches",
     "walk_collect",
+    "walk_collect_columns",
+    "walk_count",
 ]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from array import array
 from collections.abc import Iterator, Sequence
 from os import PathLike
 from typing import (
@@ -69,6 +70,12 @@ class WalkIter:
     def __iter__(self) -> Iterator[WalkEntry]: ...
     def __next__(self) -> WalkEntry: ...
 
+class WalkBatchIter:
+    """Streaming iterator over batches of directory entries."""
+
+    def __iter__(self) -> Iterator[list[WalkEntry]]: ...
+    def __next__(self) -> list[WalkEntry]: ...
+
 def walk(
     path: str | PathLike[str],
     *,
@@ -79,6 +86,17 @@ def walk(
     file_type: Literal["file", "dir", "any"] = "any",
     glob_pattern: str | None = None,
 ) -> WalkIter: ...
+def walk_batches(
+    path: str | PathLike[str],
+    *,
+    batch: int = 4096,
+    max_depth: int | None = None,
+    follow_symlinks: bool = False,
+    sort: bool = False,
+    skip_hidden: bool = False,
+    file_type: Literal["file", "dir", "any"] = "any",
+    glob_pattern: str | None = None,
+) -> WalkBatchIter: ...
 def walk_collect(
     path: str | PathLike[str],
     *,
@@ -89,6 +107,25 @@ def walk_collect(
     file_type: Literal["file", "dir", "any"] = "any",
     glob_pattern: str | None = None,
 ) -> list[WalkEntry]: ...
+def walk_collect_columns(
+    path: str | PathLike[str],
+    *,
+    max_depth: int | None = None,
+    follow_symlinks: bool = False,
+    sort: bool = False,
+    skip_hidden: bool = False,
+    file_type: Literal["file", "dir", "any"] = "any",
+    glob_pattern: str | None = None,
+) -> tuple[list[str], array[int], array[int], array[int]]: ...
+def walk_count(
+    path: str | PathLike[str],
+    *,
+    max_depth: int | None = None,
+    follow_symlinks: bool = False,
+    skip_hidden: bool = False,
+    file_type: Literal["file", "dir", "any"] = "any",
+    glob_pattern: str | None = None,
+) -> int: ...
 
 # ──── Hash ────
 
@@ -120,7 +157,23 @@ def hash_files(
     chunk_size: int = 1_048_576,
     max_workers: int | None = None,
     callback: Callable[[HashResult], None] | None = None,
+    mmap_rayon: bool = False,
+    pin_cores: bool = False,
+    drop_cache: bool = False,
 ) -> list[HashResult]: ...
+def hash_files_into(
+    paths: Sequence[str | PathLike[str]],
+    out: bytearray,
+    *,
+    out_sizes: bytearray | None = None,
+    algorithm: Literal["sha256", "blake3"] = "blake3",
+    chunk_size: int = 1_048_576,
+    max_workers: int | None = None,
+    mmap_rayon: bool = False,
+    pin_cores: bool = False,
+    drop_cache: bool = False,
+) -> list[int]: ...
+def cpu_features() -> list[str]: ...
 
 # ──── Copy / Move ────
 
@@ -141,6 +194,8 @@ class CopyProgress:
     def total_files(self) -> int: ...
     @property
     def current_file(self) -> str: ...
+    @property
+    def method_breakdown(self) -> dict[str, int]: ...
     def __repr__(self) -> str: ...
 
 def copy_files(
@@ -151,6 +206,9 @@ def copy_files(
     preserve_metadata: bool = True,
     progress_callback: Callable[[CopyProgress], None] | None = None,
     callback_interval_ms: int = 100,
+    method: Literal[
+        "auto", "reflink", "copy_file_range", "sendfile", "splice", "userspace"
+    ] = "auto",
 ) -> list[str]: ...
 def move_files(
     sources: Sequence[str | PathLike[str]],
@@ -190,6 +248,8 @@ class FileWatcher:
     def start(self) -> None: ...
     def stop(self) -> None: ...
     def poll_events(self, timeout_ms: int = 1000) -> list[FileChange]: ...
+    def event_fd(self) -> int: ...
+    def drain_events(self) -> list[FileChange]: ...
     def __enter__(self) -> FileWatcher: ...
     def __exit__(self, *args: object) -> None: ...
     def __iter__(self) -> Iterator[list[FileChange]]: ...
@@ -207,6 +267,8 @@ class DuplicateGroup:
     @property
     def paths(self) -> list[str]: ...
     @property
+    def sharing(self) -> Literal["none", "reflink", "partial"]: ...
+    @property
     def wasted_bytes(self) -> int: ...
     def __repr__(self) -> str: ...
     def __len__(self) -> int: ...
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncIterator, Sequence
+import sys
+from collections.abc import AsyncGenerator, Sequence
 from os import PathLike
 
 from pyfs_watcher._core import FileChange, FileWatcher
@@ -16,10 +17,15 @@ async def async_watch(
     debounce_ms: int = 500,
     ignore_patterns: Sequence[str] | None = None,
     poll_interval_ms: int = 100,
-) -> AsyncIterator[list[FileChange]]:
+) -> AsyncGenerator[list[FileChange], None]:
     """
     Async generator that yields batches of file changes.
 
+    On Unix the watcher's event fd is registered with the running loop, so the
+    generator wakes only when events arrive. Elsewhere (or on loops without
+    ``add_reader`` support) it falls back to polling every
+    ``poll_interval_ms`` in a thread executor.
+
     Usage:
         async for changes in async_watch("/path/to/dir"):
             for change in changes:
@@ -29,14 +35,38 @@ async def async_watch(
         str(path),
         recursive=recursive,
         debounce_ms=debounce_ms,
-        ignore_patterns=list(ignore_patterns) if ignore_patterns else None,
+        ignore_patterns=ignore_patterns,
     )
     watcher.start()
     loop = asyncio.get_running_loop()
     try:
+        fd = watcher.event_fd() if sys.platform != "win32" else None
         while True:
-            events = await loop.run_in_executor(None, watcher.poll_events, poll_interval_ms)
+            if fd is not None:
+                try:
+                    await _wait_readable(loop, fd)
+                except NotImplementedError:
+                    fd = None
+                    continue
+                events = watcher.drain_events()
+            else:
+                events = await loop.run_in_executor(None, watcher.poll_events, poll_interval_ms)
             if events:
                 yield events
     finally:
         watcher.stop()
+
+
+async def _wait_readable(loop: asyncio.AbstractEventLoop, fd: int) -> None:
+    """Wait until ``fd`` is readable without occupying an executor thread."""
+    ready = loop.create_future()
+
+    def wake() -> None:
+        if not ready.done():
+            ready.set_result(None)
+
+    loop.add_reader(fd, wake)
+    try:
+        await ready
+    finally:
+        loop.remove_reader(fd)
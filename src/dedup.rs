@@ -1,6 +1,6 @@
 use std::collections::HashMap;
 use std::fs;
-use std::path::PathBuf;
+use std::path::{Path, PathBuf};
 
 use pyo3::prelude::*;
 use rayon::prelude::*;
@@ -8,6 +8,14 @@ use rayon::prelude::*;
 use crate::errors::FsError;
 use crate::hash::{self, Algorithm};
 
+/// Files up to this multiple of `partial_hash_size` are read once, with the
+/// partial and full hashes both computed from the same buffer.
+const FUSED_HASH_FACTOR: u64 = 4;
+
+/// A partial-hash candidate plus its full hash, when it was already computed
+/// during the partial stage.
+type Candidate = (PathBuf, Option<String>);
+
 /// A group of files that are duplicates of each other.
 #[pyclass(frozen)]
 #[derive(Clone)]
@@ -18,6 +26,9 @@ pub struct DuplicateGroup {
     pub file_size: u64,
     #[pyo3(get)]
     pub paths: Vec<String>,
+    /// "none", "reflink" (every path shares the same extents) or "partial".
+    #[pyo3(get)]
+    pub sharing: String,
 }
 
 #[pymethods]
@@ -49,8 +60,13 @@ impl DuplicateGroup {
 ///
 /// Pipeline:
 /// 1. Walk all paths, group by file size
-/// 2. Partial hash (first + last `partial_hash_size` bytes)
-/// 3. Full hash only for files matching in steps 1 and 2
+/// 2. Extent probe: files mapping to identical extents (reflinks) are equal
+///    without reading them, so each such cluster is hashed only once
+/// 3. Partial hash (first + last `partial_hash_size` bytes)
+/// 4. Full hash only for files matching in steps 1 to 3
+///
+/// Files no larger than `FUSED_HASH_FACTOR * partial_hash_size` are read whole
+/// in step 3, so step 4 reuses their full hash instead of reopening them.
 #[pyfunction]
 #[pyo3(signature = (paths, *, recursive=true, min_size=1, algorithm="blake3", partial_hash_size=4096, max_workers=None, progress_callback=None))]
 #[allow(clippy::too_many_arguments)]
@@ -101,21 +117,56 @@ pub fn find_duplicates(
         total_files,
     )?;
 
-    // Stage 2: Partial hash
-    report_progress(py, &progress_callback, "partial_hash", 0, candidate_count)?;
+    // Stage 2: Extent probe
+    report_progress(py, &progress_callback, "extent_probe", 0, candidate_count)?;
+
+    let (probed_groups, shared) = py.allow_threads(|| {
+        let work = || extent_probe_stage(&candidates_after_size);
+        match &pool {
+            Some(p) => p.install(work),
+            None => work(),
+        }
+    });
+
+    // A group left with a single reflink cluster needs no comparison, only
+    // one full hash of its representative for `hash_hex`
+    let mut lone_clusters: Vec<(String, u64, Vec<Candidate>)> = Vec::new();
+    let mut candidates_after_probe: Vec<(u64, Vec<PathBuf>)> = Vec::new();
+    for (size, mut files) in probed_groups {
+        if files.len() > 1 {
+            candidates_after_probe.push((size, files));
+        } else if let Some(path) = files.pop().filter(|p| shared.contains_key(p)) {
+            lone_clusters.push((String::new(), size, vec![(path, None)]));
+        }
+    }
+
+    let probe_count: usize = candidates_after_probe.iter().map(|(_, f)| f.len()).sum();
+    report_progress(
+        py,
+        &progress_callback,
+        "extent_probe",
+        probe_count,
+        candidate_count,
+    )?;
+
+    // Stage 3: Partial hash
+    report_progress(py, &progress_callback, "partial_hash", 0, probe_count)?;
 
     let partial_groups = py.allow_threads(|| {
-        let work = || partial_hash_stage(&candidates_after_size, algo, partial_hash_size);
+        let work = || partial_hash_stage(&candidates_after_probe, algo, partial_hash_size);
         match &pool {
             Some(p) => p.install(work),
             None => work(),
         }
     });
 
-    let candidates_after_partial: Vec<(String, u64, Vec<PathBuf>)> = partial_groups
-        .into_iter()
-        .filter(|(_, _, files)| files.len() > 1)
-        .collect();
+    // A unique partial hash is dropped unless it stands for a reflink cluster
+    let mut candidates_after_partial = lone_clusters;
+    for (partial, size, files) in partial_groups {
+        if files.len() > 1 || shared.contains_key(&files[0].0) {
+            candidates_after_partial.push((partial, size, files));
+        }
+    }
 
     let partial_count: usize = candidates_after_partial
         .iter()
@@ -126,10 +177,10 @@ pub fn find_duplicates(
         &progress_callback,
         "partial_hash",
         partial_count,
-        candidate_count,
+        probe_count,
     )?;
 
-    // Stage 3: Full hash
+    // Stage 4: Full hash
     report_progress(py, &progress_callback, "full_hash", 0, partial_count)?;
 
     let full_groups = py.allow_threads(|| {
@@ -142,15 +193,7 @@ pub fn find_duplicates(
 
     let mut duplicates: Vec<DuplicateGroup> = full_groups
         .into_iter()
-        .filter(|(_, _, files)| files.len() > 1)
-        .map(|(hash_hex, size, files)| DuplicateGroup {
-            hash_hex,
-            file_size: size,
-            paths: files
-                .into_iter()
-                .map(|p| p.to_string_lossy().into_owned())
-                .collect(),
-        })
+        .filter_map(|(hash_hex, size, files)| expand_shared(hash_hex, size, files, &shared))
         .collect();
 
     // Sort by wasted bytes descending (worst offenders first)
@@ -224,28 +267,260 @@ fn group_by_size(entries: Vec<(PathBuf, u64)>) -> HashMap<u64, Vec<PathBuf>> {
     groups
 }
 
+/// Collapse files with identical extent maps into one representative each.
+///
+/// Returns the size groups with every cluster reduced to its first path, plus
+/// a map from each representative to the other members of its cluster.
+fn extent_probe_stage(
+    size_groups: &[(u64, Vec<PathBuf>)],
+) -> (Vec<(u64, Vec<PathBuf>)>, HashMap<PathBuf, Vec<PathBuf>>) {
+    let mut results: Vec<(u64, Vec<PathBuf>)> = Vec::new();
+    let mut shared: HashMap<PathBuf, Vec<PathBuf>> = HashMap::new();
+
+    for (size, files) in size_groups {
+        let extents: Vec<Option<Vec<Extent>>> = files
+            .par_iter()
+            .map(|path| shared_extents(path.as_path()))
+            .collect();
+
+        let mut remaining: Vec<PathBuf> = Vec::new();
+        let mut clusters: HashMap<Vec<Extent>, Vec<PathBuf>> = HashMap::new();
+        for (path, extents) in files.iter().zip(extents) {
+            match extents {
+                Some(e) => clusters.entry(e).or_default().push(path.clone()),
+                None => remaining.push(path.clone()),
+            }
+        }
+
+        for (_, mut members) in clusters {
+            let representative = members.remove(0);
+            if !members.is_empty() {
+                shared.insert(representative.clone(), members);
+            }
+            remaining.push(representative);
+        }
+
+        results.push((*size, remaining));
+    }
+
+    (results, shared)
+}
+
+/// Build a DuplicateGroup, re-adding the reflink cluster members behind each
+/// representative. Returns `None` if fewer than two paths remain.
+fn expand_shared(
+    hash_hex: String,
+    file_size: u64,
+    files: Vec<PathBuf>,
+    shared: &HashMap<PathBuf, Vec<PathBuf>>,
+) -> Option<DuplicateGroup> {
+    let representatives = files.iter().filter(|p| shared.contains_key(*p)).count();
+    let sharing = if representatives == 0 {
+        "none"
+    } else if files.len() == 1 {
+        "reflink"
+    } else {
+        "partial"
+    };
+
+    let mut paths = Vec::new();
+    for path in files {
+        let members = shared.get(&path);
+        paths.push(path.to_string_lossy().into_owned());
+        if let Some(members) = members {
+            paths.extend(members.iter().map(|p| p.to_string_lossy().into_owned()));
+        }
+    }
+
+    if paths.len() < 2 {
+        return None;
+    }
+
+    Some(DuplicateGroup {
+        hash_hex,
+        file_size,
+        paths,
+        sharing: sharing.to_string(),
+    })
+}
+
+/// One mapped extent: (logical offset, physical offset, length).
+type Extent = (u64, u64, u64);
+
+/// The complete extent map of `path`, if it is fully known and at least one
+/// extent is shared. Two same-sized files with identical maps read back the
+/// same bytes, so comparing maps is a valid content comparison.
+#[cfg(target_os = "linux")]
+fn shared_extents(path: &Path) -> Option<Vec<Extent>> {
+    fiemap::extents(path)
+        .filter(|(extents, any_shared)| *any_shared && !extents.is_empty())
+        .map(|(extents, _)| extents)
+}
+
+#[cfg(not(target_os = "linux"))]
+fn shared_extents(_path: &Path) -> Option<Vec<Extent>> {
+    None
+}
+
+/// `FS_IOC_FIEMAP` extent queries.
+#[cfg(target_os = "linux")]
+mod fiemap {
+    use std::ffi::CString;
+    use std::fs::File;
+    use std::os::unix::ffi::OsStrExt;
+    use std::os::unix::io::AsRawFd;
+    use std::path::Path;
+
+    use super::Extent;
+
+    /// `_IOWR('f', 11, struct fiemap)` from <linux/fs.h>.
+    const FS_IOC_FIEMAP: u64 = 0xC020_660B;
+    /// Flush dirty pages first: until writeback, an overwritten reflinked
+    /// file (XFS COW fork) still reports its old shared extent.
+    const FIEMAP_FLAG_SYNC: u32 = 0x0001;
+
+    const FIEMAP_EXTENT_LAST: u32 = 0x0001;
+    const FIEMAP_EXTENT_SHARED: u32 = 0x2000;
+    /// Extents without a stable physical location that can't be compared:
+    /// UNKNOWN, DELALLOC, ENCODED, DATA_INLINE, DATA_TAIL.
+    const FIEMAP_EXTENT_UNSTABLE: u32 = 0x0002 | 0x0004 | 0x0008 | 0x0200 | 0x0400;
+
+    /// Extents fetched per ioctl call.
+    const BATCH: usize = 64;
+    /// Heavily fragmented files are cheaper to hash than to compare maps.
+    const MAX_EXTENTS: usize = 4096;
+
+    /// `statfs` magics of the filesystems that can share extents between files.
+    const BTRFS_SUPER_MAGIC: u32 = 0x9123_683E;
+    const XFS_SUPER_MAGIC: u32 = 0x5846_5342;
+    const BCACHEFS_SUPER_MAGIC: u32 = 0xCA45_1A4E;
+
+    #[repr(C)]
+    #[derive(Clone, Copy, Default)]
+    struct FiemapExtent {
+        fe_logical: u64,
+        fe_physical: u64,
+        fe_length: u64,
+        fe_reserved64: [u64; 2],
+        fe_flags: u32,
+        fe_reserved: [u32; 3],
+    }
+
+    #[repr(C)]
+    struct Fiemap {
+        fm_start: u64,
+        fm_length: u64,
+        fm_flags: u32,
+        fm_mapped_extents: u32,
+        fm_extent_count: u32,
+        fm_reserved: u32,
+        fm_extents: [FiemapExtent; BATCH],
+    }
+
+    /// Return the file's extents and whether any of them is shared, or `None`
+    /// if the filesystem doesn't support FIEMAP or the map can't be compared.
+    pub fn extents(path: &Path) -> Option<(Vec<Extent>, bool)> {
+        if !can_share_extents(path) {
+            return None;
+        }
+        let file = File::open(path).ok()?;
+        let mut extents = Vec::new();
+        let mut any_shared = false;
+        let mut start = 0u64;
+
+        loop {
+            let mut map = Fiemap {
+                fm_start: start,
+                fm_length: u64::MAX - start,
+                fm_flags: FIEMAP_FLAG_SYNC,
+                fm_mapped_extents: 0,
+                fm_extent_count: BATCH as u32,
+                fm_reserved: 0,
+                fm_extents: [FiemapExtent::default(); BATCH],
+            };
+            let ret = unsafe {
+                libc::ioctl(
+                    file.as_raw_fd(),
+                    FS_IOC_FIEMAP as _,
+                    &mut map as *mut Fiemap,
+                )
+            };
+            if ret < 0 {
+                return None;
+            }
+
+            let mapped = map.fm_mapped_extents as usize;
+            if mapped == 0 {
+                return Some((extents, any_shared));
+            }
+
+            for fe in &map.fm_extents[..mapped.min(BATCH)] {
+                if fe.fe_flags & FIEMAP_EXTENT_UNSTABLE != 0 {
+                    return None;
+                }
+                any_shared |= fe.fe_flags & FIEMAP_EXTENT_SHARED != 0;
+                extents.push((fe.fe_logical, fe.fe_physical, fe.fe_length));
+                if fe.fe_flags & FIEMAP_EXTENT_LAST != 0 {
+                    return Some((extents, any_shared));
+                }
+            }
+
+            if extents.len() > MAX_EXTENTS {
+                return None;
+            }
+            let (logical, _, length) = extents[extents.len() - 1];
+            start = logical + length;
+        }
+    }
+
+    /// Whether `path` lives on a filesystem with reflinks, checked with a
+    /// single `statfs` so other filesystems are never opened or probed.
+    fn can_share_extents(path: &Path) -> bool {
+        let Ok(c_path) = CString::new(path.as_os_str().as_bytes()) else {
+            return false;
+        };
+        unsafe {
+            let mut buf: libc::statfs = std::mem::zeroed();
+            if libc::statfs(c_path.as_ptr(), &mut buf) != 0 {
+                return false;
+            }
+            matches!(
+                buf.f_type as u32,
+                BTRFS_SUPER_MAGIC | XFS_SUPER_MAGIC | BCACHEFS_SUPER_MAGIC
+            )
+        }
+    }
+}
+
 fn partial_hash_stage(
     size_groups: &[(u64, Vec<PathBuf>)],
     algo: Algorithm,
     partial_size: usize,
-) -> Vec<(String, u64, Vec<PathBuf>)> {
-    let mut results: Vec<(String, u64, Vec<PathBuf>)> = Vec::new();
+) -> Vec<(String, u64, Vec<Candidate>)> {
+    let mut results: Vec<(String, u64, Vec<Candidate>)> = Vec::new();
 
     for (size, files) in size_groups {
+        let fused = *size <= partial_size as u64 * FUSED_HASH_FACTOR;
+
         // Hash all files in this group in parallel
-        let hashes: Vec<(PathBuf, Option<String>)> = files
+        let hashes: Vec<(PathBuf, Option<(String, Option<String>)>)> = files
             .par_iter()
             .map(|path| {
-                let hash = hash::partial_hash(path, algo, partial_size).ok();
-                (path.clone(), hash)
+                let hash = if fused {
+                    hash::partial_and_full_hash(path, algo, partial_size)
+                        .map(|(partial, full)| (partial, Some(full)))
+                } else {
+                    hash::partial_hash(path, algo, partial_size).map(|partial| (partial, None))
+                };
+                (path.clone(), hash.ok())
             })
             .collect();
 
         // Group by partial hash
-        let mut hash_groups: HashMap<String, Vec<PathBuf>> = HashMap::new();
+        let mut hash_groups: HashMap<String, Vec<Candidate>> = HashMap::new();
         for (path, hash) in hashes {
-            if let Some(h) = hash {
-                hash_groups.entry(h).or_default().push(path);
+            if let Some((partial, full)) = hash {
+                hash_groups.entry(partial).or_default().push((path, full));
             }
         }
 
@@ -258,18 +533,23 @@ fn partial_hash_stage(
 }
 
 fn full_hash_stage(
-    partial_groups: &[(String, u64, Vec<PathBuf>)],
+    partial_groups: &[(String, u64, Vec<Candidate>)],
     algo: Algorithm,
 ) -> Vec<(String, u64, Vec<PathBuf>)> {
     let mut results: Vec<(String, u64, Vec<PathBuf>)> = Vec::new();
 
     for (_partial_hash, size, files) in partial_groups {
-        // Full-hash all files in this group in parallel
+        // Full-hash all files in this group in parallel, reusing fused hashes
         let hashes: Vec<(PathBuf, Option<String>)> = files
             .par_iter()
-            .map(|path| {
-                let result = hash::hash_file_internal(path, algo, 1_048_576).ok();
-                (path.clone(), result.map(|r| r.hash_hex))
+            .map(|(path, full)| {
+                let hash = match full {
+                    Some(h) => Some(h.clone()),
+                    None => hash::hash_file_internal(path, algo, 1_048_576)
+                        .ok()
+                        .map(|r| r.hash_hex),
+                };
+                (path.clone(), hash)
             })
             .collect();
 
@@ -311,6 +591,38 @@ mod tests {
         assert_eq!(groups[&300].len(), 1);
     }
 
+    #[test]
+    fn test_expand_shared() {
+        let mut shared = HashMap::new();
+        shared.insert(PathBuf::from("/r"), vec![PathBuf::from("/r2")]);
+
+        let only_cluster =
+            expand_shared("h".to_string(), 10, vec![PathBuf::from("/r")], &shared).unwrap();
+        assert_eq!(only_cluster.sharing, "reflink");
+        assert_eq!(only_cluster.paths, vec!["/r", "/r2"]);
+
+        let mixed = expand_shared(
+            "h".to_string(),
+            10,
+            vec![PathBuf::from("/r"), PathBuf::from("/c")],
+            &shared,
+        )
+        .unwrap();
+        assert_eq!(mixed.sharing, "partial");
+        assert_eq!(mixed.paths.len(), 3);
+
+        let plain = expand_shared(
+            "h".to_string(),
+            10,
+            vec![PathBuf::from("/a"), PathBuf::from("/b")],
+            &shared,
+        )
+        .unwrap();
+        assert_eq!(plain.sharing, "none");
+
+        assert!(expand_shared("h".to_string(), 10, vec![PathBuf::from("/a")], &shared).is_none());
+    }
+
     #[test]
     fn test_collect_files() {
         let tmp = TempDir::new().unwrap();
@@ -4,10 +4,14 @@ use std::path::{Path, PathBuf};
 
 use digest::Digest;
 use pyo3::prelude::*;
+use pyo3::types::PyByteArray;
 use rayon::prelude::*;
 
 use crate::errors::FsError;
-use crate::utils::{mmap_file, MMAP_THRESHOLD};
+use crate::utils::{
+    advise_sequential, drop_page_cache, mmap_file, pin_current_thread, prefetch_file,
+    MMAP_THRESHOLD,
+};
 
 /// Result of hashing a file.
 #[pyclass(frozen)]
@@ -48,6 +52,14 @@ impl HashResult {
     }
 }
 
+/// Raw digest size shared by SHA-256 and BLAKE3.
+pub const DIGEST_LEN: usize = 32;
+
+/// Bytes per file size written by `hash_files_into` (native-endian int64).
+const SIZE_LEN: usize = 8;
+
+pub type Digest32 = [u8; DIGEST_LEN];
+
 #[derive(Clone, Copy)]
 pub enum Algorithm {
     Sha256,
@@ -90,9 +102,55 @@ pub fn hash_file(
     Ok(result)
 }
 
+/// CPU features relevant to hashing throughput, detected at runtime.
+///
+/// On x86, `sha2` and `blake3` pick their SIMD backends with the same runtime
+/// checks, so `"sha_ni"` here means SHA-256 runs on hardware SHA instructions.
+/// `"sha2"` on ARM only reports the CPU capability: `sha2` is built without
+/// its `asm` feature, so SHA-256 uses the portable implementation there.
+#[pyfunction]
+pub fn cpu_features() -> Vec<&'static str> {
+    let mut features = Vec::new();
+
+    #[cfg(any(target_arch = "x86", target_arch = "x86_64"))]
+    {
+        if std::arch::is_x86_feature_detected!("sha") {
+            features.push("sha_ni");
+        }
+        if std::arch::is_x86_feature_detected!("sse4.1") {
+            features.push("sse4_1");
+        }
+        if std::arch::is_x86_feature_detected!("avx2") {
+            features.push("avx2");
+        }
+        if std::arch::is_x86_feature_detected!("avx512f") {
+            features.push("avx512f");
+        }
+    }
+
+    #[cfg(target_arch = "aarch64")]
+    {
+        if std::arch::is_aarch64_feature_detected!("neon") {
+            features.push("neon");
+        }
+        if std::arch::is_aarch64_feature_detected!("sha2") {
+            features.push("sha2");
+        }
+    }
+
+    features
+}
+
 /// Hash multiple files in parallel using rayon.
+///
+/// With `mmap_rayon=True`, large BLAKE3 inputs are additionally split across
+/// the pool (intra-file parallelism), which helps when there are fewer files
+/// than cores. With `pin_cores=True`, each worker is pinned to its own CPU.
+/// With `drop_cache=True`, the pages of large files are released from the
+/// page cache once hashed.
 #[pyfunction]
-#[pyo3(signature = (paths, *, algorithm="blake3", chunk_size=1_048_576, max_workers=None, callback=None))]
+#[pyo3(signature = (paths, *, algorithm="blake3", chunk_size=1_048_576, max_workers=None, callback=None, mmap_rayon=false, pin_cores=false, drop_cache=false))]
+#[allow(clippy::too_many_arguments)]
 pub fn hash_files(
     py: Python<'_>,
     paths: Vec<String>,
@@ -100,37 +158,185 @@ pub fn hash_files(
     chunk_size: usize,
     max_workers: Option<usize>,
     callback: Option<PyObject>,
+    mmap_rayon: bool,
+    pin_cores: bool,
+    drop_cache: bool,
 ) -> PyResult<Vec<HashResult>> {
     let algo = Algorithm::from_str(algorithm)?;
     let file_paths: Vec<PathBuf> = paths.into_iter().map(PathBuf::from).collect();
 
+    let results: Vec<Result<HashResult, FsError>> = py.allow_threads(|| {
+        run_in_pool(max_workers, pin_cores, || {
+            digest_all(&file_paths, algo, chunk_size, mmap_rayon, drop_cache)
+                .into_iter()
+                .zip(&file_paths)
+                .map(|(result, path)| {
+                    let (digest, size) = result?;
+                    Ok(to_hash_result(path, algo, &digest, size))
+                })
+                .collect()
+        })
+    })?;
+
+    process_results(py, results, callback)
+}
+
+/// Hash multiple files in parallel, writing raw digests into a buffer.
+///
+/// Digest `i` (32 bytes for both algorithms) is written to
+/// `out[i * 32..(i + 1) * 32]`, skipping the per-file `HashResult` and hex
+/// string allocations. If `out_sizes` is given, the size of file `i` is
+/// written to `out_sizes[i * 8..(i + 1) * 8]` as a native-endian int64.
+/// Returns the indices of files that could not be hashed; their slots are
+/// zero-filled.
+#[pyfunction]
+#[pyo3(signature = (paths, out, *, out_sizes=None, algorithm="blake3", chunk_size=1_048_576, max_workers=None, mmap_rayon=false, pin_cores=false, drop_cache=false))]
+#[allow(clippy::too_many_arguments)]
+pub fn hash_files_into(
+    py: Python<'_>,
+    paths: Vec<String>,
+    out: &Bound<'_, PyByteArray>,
+    out_sizes: Option<&Bound<'_, PyByteArray>>,
+    algorithm: &str,
+    chunk_size: usize,
+    max_workers: Option<usize>,
+    mmap_rayon: bool,
+    pin_cores: bool,
+    drop_cache: bool,
+) -> PyResult<Vec<usize>> {
+    let algo = Algorithm::from_str(algorithm)?;
+    let count = paths.len();
+    let needed = count * DIGEST_LEN;
+    let needed_sizes = count * SIZE_LEN;
+    check_buffer(out, "output", needed, count)?;
+    if let Some(out_sizes) = out_sizes {
+        check_buffer(out_sizes, "size", needed_sizes, count)?;
+    }
+    let file_paths: Vec<PathBuf> = paths.into_iter().map(PathBuf::from).collect();
+
+    // Hash into Rust-owned buffers while the GIL is released; the bytearrays
+    // could be resized by other Python threads in the meantime.
+    let (digests, sizes, failed) = py.allow_threads(|| {
+        run_in_pool(max_workers, pin_cores, || {
+            let mut digests = vec![0u8; needed];
+            let mut sizes = vec![0u8; needed_sizes];
+            let mut failed = Vec::new();
+            let results = digest_all(&file_paths, algo, chunk_size, mmap_rayon, drop_cache);
+            for (i, ((result, slot), size_slot)) in results
+                .into_iter()
+                .zip(digests.chunks_mut(DIGEST_LEN))
+                .zip(sizes.chunks_mut(SIZE_LEN))
+                .enumerate()
+            {
+                match result {
+                    Ok((digest, size)) => {
+                        slot.copy_from_slice(&digest);
+                        size_slot.copy_from_slice(&size.to_ne_bytes());
+                    }
+                    Err(e) => {
+                        log::warn!("hash error: {}", e);
+                        failed.push(i);
+                    }
+                }
+            }
+            (digests, sizes, failed)
+        })
+    })?;
+
+    // Re-check now that the GIL is held again, before writing anything
+    check_buffer(out, "output", needed, count)?;
+    if let Some(out_sizes) = out_sizes {
+        check_buffer(out_sizes, "size", needed_sizes, count)?;
+    }
+
+    // SAFETY: we hold the GIL and keep no other reference into the buffers.
+    unsafe {
+        out.as_bytes_mut()[..needed].copy_from_slice(&digests);
+        if let Some(out_sizes) = out_sizes {
+            out_sizes.as_bytes_mut()[..needed_sizes].copy_from_slice(&sizes);
+        }
+    }
+
+    Ok(failed)
+}
+
+fn check_buffer(
+    buf: &Bound<'_, PyByteArray>,
+    what: &str,
+    needed: usize,
+    count: usize,
+) -> Result<(), FsError> {
+    if buf.len() < needed {
+        return Err(FsError::Hash(format!(
+            "{} buffer too small: need {} bytes for {} paths, got {}",
+            what,
+            needed,
+            count,
+            buf.len()
+        )));
+    }
+    Ok(())
+}
+
+/// Run `work` on a dedicated rayon pool of `max_workers` threads, or on the
+/// global pool if `None`.
+fn run_in_pool<T, F>(max_workers: Option<usize>, pin_cores: bool, work: F) -> Result<T, FsError>
+where
+    T: Send,
+    F: FnOnce() -> T + Send,
+{
+    if max_workers.is_none() && !pin_cores {
+        return Ok(work());
+    }
+
+    let mut builder = rayon::ThreadPoolBuilder::new();
     if let Some(workers) = max_workers {
-        // Build a custom rayon pool if max_workers is specified
-        let pool = rayon::ThreadPoolBuilder::new()
-            .num_threads(workers)
-            .build()
-            .map_err(|e| FsError::Hash(format!("failed to create thread pool: {}", e)))?;
-
-        let results: Vec<Result<HashResult, FsError>> = py.allow_threads(|| {
-            pool.install(|| {
-                file_paths
-                    .par_iter()
-                    .map(|p| hash_file_internal(p, algo, chunk_size))
-                    .collect()
+        builder = builder.num_threads(workers);
+    }
+    if pin_cores {
+        builder = builder.start_handler(pin_current_thread);
+    }
+    let pool = builder
+        .build()
+        .map_err(|e| FsError::Hash(format!("failed to create thread pool: {}", e)))?;
+    Ok(pool.install(work))
+}
+
+/// Digest every path on the current rayon pool, results in input order.
+///
+/// Paths are split into contiguous runs that are each hashed sequentially on
+/// one worker, so prefetching the next file of a run overlaps its read with
+/// the current hash without touching files owned by other workers.
+fn digest_all(
+    paths: &[PathBuf],
+    algo: Algorithm,
+    chunk_size: usize,
+    mmap_rayon: bool,
+    drop_cache: bool,
+) -> Vec<Result<(Digest32, u64), FsError>> {
+    let run_len = prefetch_run_len(paths.len(), rayon::current_num_threads());
+
+    paths
+        .par_chunks(run_len)
+        .flat_map_iter(|run| {
+            run.iter().enumerate().map(move |(j, path)| {
+                if let Some(next) = run.get(j + 1) {
+                    prefetch_file(next);
+                }
+                digest_file(path, algo, chunk_size, mmap_rayon, drop_cache)
             })
-        });
+        })
+        .collect()
+}
 
-        process_results(py, results, callback)
-    } else {
-        let results: Vec<Result<HashResult, FsError>> = py.allow_threads(|| {
-            file_paths
-                .par_iter()
-                .map(|p| hash_file_internal(p, algo, chunk_size))
-                .collect()
-        });
+/// Bounds on the runs `digest_all` hashes sequentially on one worker.
+const MIN_PREFETCH_RUN: usize = 4;
+const MAX_PREFETCH_RUN: usize = 64;
 
-        process_results(py, results, callback)
-    }
+/// About one run per worker, but never shorter than `MIN_PREFETCH_RUN`, so
+/// prefetching still happens when there are only a few files per worker.
+fn prefetch_run_len(files: usize, threads: usize) -> usize {
+    (files / threads.max(1)).clamp(MIN_PREFETCH_RUN, MAX_PREFETCH_RUN)
 }
 
 fn process_results(
@@ -164,43 +370,94 @@ pub fn hash_file_internal(
     algorithm: Algorithm,
     chunk_size: usize,
 ) -> Result<HashResult, FsError> {
+    let (digest, file_size) = digest_file(path, algorithm, chunk_size, false, false)?;
+    Ok(to_hash_result(path, algorithm, &digest, file_size))
+}
+
+/// Compute the raw 32-byte digest of a file, returning it with the file size.
+///
+/// Uses mmap for files above `MMAP_THRESHOLD` and buffered reads otherwise.
+/// With `mmap_rayon`, large BLAKE3 inputs are hashed with `update_mmap_rayon`,
+/// splitting a single file across the current rayon pool; SHA-256 cannot be
+/// parallelized within a file, so it is unaffected. With `drop_cache`, the
+/// pages of those large files are released from the page cache afterwards.
+pub fn digest_file(
+    path: &Path,
+    algorithm: Algorithm,
+    chunk_size: usize,
+    mmap_rayon: bool,
+    drop_cache: bool,
+) -> Result<(Digest32, u64), FsError> {
     let metadata = fs::metadata(path)?;
     let file_size = metadata.len();
 
-    let hash_hex = if file_size > MMAP_THRESHOLD {
-        // Use mmap for large files
+    let digest = if file_size > MMAP_THRESHOLD {
         let file = File::open(path)?;
-        let mmap = mmap_file(&file)?;
-        hash_bytes(&mmap, algorithm)
+        let digest = if mmap_rayon && matches!(algorithm, Algorithm::Blake3) {
+            let mut hasher = blake3::Hasher::new();
+            hasher.update_mmap_rayon(path)?;
+            hasher.finalize().into()
+        } else {
+            // Use mmap for large files, read front to back exactly once
+            let mmap = mmap_file(&file)?;
+            #[cfg(unix)]
+            let _ = mmap.advise(memmap2::Advice::Sequential);
+            digest_bytes(&mmap, algorithm)
+        };
+        if drop_cache {
+            drop_page_cache(&file);
+        }
+        digest
     } else {
         // Use buffered reads for smaller files
-        hash_buffered(path, algorithm, chunk_size)?
+        digest_buffered(path, algorithm, chunk_size)?
     };
 
-    Ok(HashResult {
+    Ok((digest, file_size))
+}
+
+fn to_hash_result(
+    path: &Path,
+    algorithm: Algorithm,
+    digest: &Digest32,
+    file_size: u64,
+) -> HashResult {
+    HashResult {
         path: path.to_string_lossy().into_owned(),
-        hash_hex,
+        hash_hex: to_hex(digest),
         algorithm: algorithm.name().to_string(),
         file_size,
-    })
+    }
 }
 
-fn hash_bytes(data: &[u8], algorithm: Algorithm) -> String {
+fn to_hex(digest: &Digest32) -> String {
+    use std::fmt::Write;
+
+    let mut hex = String::with_capacity(DIGEST_LEN * 2);
+    for byte in digest {
+        let _ = write!(hex, "{:02x}", byte);
+    }
+    hex
+}
+
+fn digest_bytes(data: &[u8], algorithm: Algorithm) -> Digest32 {
     match algorithm {
         Algorithm::Sha256 => {
             let mut hasher = sha2::Sha256::new();
             hasher.update(data);
-            format!("{:x}", hasher.finalize())
-        }
-        Algorithm::Blake3 => {
-            let hash = blake3::hash(data);
-            hash.to_hex().to_string()
+            hasher.finalize().into()
         }
+        Algorithm::Blake3 => blake3::hash(data).into(),
     }
 }
 
-fn hash_buffered(path: &Path, algorithm: Algorithm, chunk_size: usize) -> Result<String, FsError> {
+fn digest_buffered(
+    path: &Path,
+    algorithm: Algorithm,
+    chunk_size: usize,
+) -> Result<Digest32, FsError> {
     let file = File::open(path)?;
+    advise_sequential(&file);
     let mut reader = BufReader::with_capacity(chunk_size, file);
     let mut buf = vec![0u8; chunk_size];
 
@@ -214,7 +471,7 @@ fn hash_buffered(path: &Path, algorithm: Algorithm, chunk_size: usize) -> Result
                 }
                 hasher.update(&buf[..n]);
             }
-            Ok(format!("{:x}", hasher.finalize()))
+            Ok(hasher.finalize().into())
         }
         Algorithm::Blake3 => {
             let mut hasher = blake3::Hasher::new();
@@ -225,7 +482,7 @@ fn hash_buffered(path: &Path, algorithm: Algorithm, chunk_size: usize) -> Result
                 }
                 hasher.update(&buf[..n]);
             }
-            Ok(hasher.finalize().to_hex().to_string())
+            Ok(hasher.finalize().into())
         }
     }
 }
@@ -237,7 +494,7 @@ pub fn partial_hash(path: &Path, algorithm: Algorithm, size: usize) -> Result<St
 
     if file_size <= (size * 2) as u64 {
         // File is small enough to hash entirely
-        return hash_buffered(path, algorithm, size);
+        return Ok(to_hex(&digest_buffered(path, algorithm, size)?));
     }
 
     let mut file = File::open(path)?;
@@ -252,18 +509,40 @@ pub fn partial_hash(path: &Path, algorithm: Algorithm, size: usize) -> Result<St
     file.read_exact(&mut tail)?;
 
     // Hash the concatenation of head + tail
+    Ok(to_hex(&digest_head_tail(&head, &tail, algorithm)))
+}
+
+/// Compute both the partial hash (as `partial_hash` would) and the full hash
+/// of a small file from a single read, returning `(partial_hex, full_hex)`.
+pub fn partial_and_full_hash(
+    path: &Path,
+    algorithm: Algorithm,
+    size: usize,
+) -> Result<(String, String), FsError> {
+    let data = fs::read(path)?;
+    let full = to_hex(&digest_bytes(&data, algorithm));
+
+    if data.len() <= size * 2 {
+        return Ok((full.clone(), full));
+    }
+
+    let partial = digest_head_tail(&data[..size], &data[data.len() - size..], algorithm);
+    Ok((to_hex(&partial), full))
+}
+
+fn digest_head_tail(head: &[u8], tail: &[u8], algorithm: Algorithm) -> Digest32 {
     match algorithm {
         Algorithm::Sha256 => {
             let mut hasher = sha2::Sha256::new();
-            hasher.update(&head);
-            hasher.update(&tail);
-            Ok(format!("{:x}", hasher.finalize()))
+            hasher.update(head);
+            hasher.update(tail);
+            hasher.finalize().into()
         }
         Algorithm::Blake3 => {
             let mut hasher = blake3::Hasher::new();
-            hasher.update(&head);
-            hasher.update(&tail);
-            Ok(hasher.finalize().to_hex().to_string())
+            hasher.update(head);
+            hasher.update(tail);
+            hasher.finalize().into()
         }
     }
 }
@@ -309,6 +588,29 @@ mod tests {
         assert!(!result.hash_hex.is_empty());
     }
 
+    #[test]
+    fn test_mmap_rayon_matches_regular() {
+        let mut f = NamedTempFile::new().unwrap();
+        let data: Vec<u8> = (0..(5 * 1024 * 1024)).map(|i| (i % 251) as u8).collect();
+        f.write_all(&data).unwrap();
+        f.flush().unwrap();
+        let regular = hash_file_internal(f.path(), Algorithm::Blake3, 1024).unwrap();
+        let (digest, size) = digest_file(f.path(), Algorithm::Blake3, 1024, true, false).unwrap();
+        assert_eq!(regular.hash_hex, to_hex(&digest));
+        assert_eq!(regular.file_size, size);
+    }
+
+    #[test]
+    fn test_prefetch_run_len() {
+        // 50 files must still be hashed in runs that prefetch, however many cores
+        for threads in [1, 4, 8, 16, 64, 256] {
+            assert!(prefetch_run_len(50, threads) > 1, "{} threads", threads);
+        }
+        assert_eq!(prefetch_run_len(50, 8), 6);
+        assert_eq!(prefetch_run_len(1_000_000, 8), MAX_PREFETCH_RUN);
+        assert_eq!(prefetch_run_len(0, 0), MIN_PREFETCH_RUN);
+    }
+
     #[test]
     fn test_partial_hash_small_file() {
         let mut f = NamedTempFile::new().unwrap();
@@ -329,4 +631,23 @@ mod tests {
         let result = partial_hash(f.path(), Algorithm::Blake3, 4096).unwrap();
         assert!(!result.is_empty());
     }
+
+    #[test]
+    fn test_partial_and_full_hash_matches_separate_passes() {
+        let mut f = NamedTempFile::new().unwrap();
+        let data: Vec<u8> = (0..3000).map(|i| (i % 251) as u8).collect();
+        f.write_all(&data).unwrap();
+        f.flush().unwrap();
+        for algo in [Algorithm::Sha256, Algorithm::Blake3] {
+            // 1024 exercises the head + tail path, 4096 the whole-file path
+            for size in [1024, 4096] {
+                let (partial, full) = partial_and_full_hash(f.path(), algo, size).unwrap();
+                assert_eq!(partial, partial_hash(f.path(), algo, size).unwrap());
+                assert_eq!(
+                    full,
+                    hash_file_internal(f.path(), algo, size).unwrap().hash_hex
+                );
+            }
+        }
+    }
 }
@@ -48,13 +48,19 @@ fn _core(py: Python, m: &Bound<'_, PyModule>) -> PyResult<()> {
     // Walk
     m.add_class::<walk::WalkEntry>()?;
     m.add_class::<walk::WalkIter>()?;
+    m.add_class::<walk::WalkBatchIter>()?;
     m.add_function(wrap_pyfunction!(walk::walk, m)?)?;
+    m.add_function(wrap_pyfunction!(walk::walk_batches, m)?)?;
     m.add_function(wrap_pyfunction!(walk::walk_collect, m)?)?;
+    m.add_function(wrap_pyfunction!(walk::walk_collect_columns, m)?)?;
+    m.add_function(wrap_pyfunction!(walk::walk_count, m)?)?;
 
     // Hash
     m.add_class::<hash::HashResult>()?;
     m.add_function(wrap_pyfunction!(hash::hash_file, m)?)?;
     m.add_function(wrap_pyfunction!(hash::hash_files, m)?)?;
+    m.add_function(wrap_pyfunction!(hash::hash_files_into, m)?)?;
+    m.add_function(wrap_pyfunction!(hash::cpu_features, m)?)?;
 
     // Copy/Move
     m.add_class::<copy::CopyProgress>()?;
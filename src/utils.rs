@@ -18,6 +18,96 @@ pub fn mmap_file(file: &File) -> std::io::Result<Mmap> {
     unsafe { Mmap::map(file) }
 }
 
+/// Upper bound on how much of a file `prefetch_file` asks the kernel to read.
+#[cfg(target_os = "linux")]
+const PREFETCH_LEN: libc::off_t = 4 * 1024 * 1024;
+
+/// Ask the kernel to start reading the first few MiB of `path` into the page
+/// cache in the background, so a later read or mmap of it does not block on
+/// the disk. Sequential readahead takes over from there for larger files.
+///
+/// Best-effort: errors are ignored and this is a no-op off Linux.
+pub fn prefetch_file(path: &Path) {
+    #[cfg(target_os = "linux")]
+    {
+        use std::os::unix::io::AsRawFd;
+
+        if let Ok(file) = File::open(path) {
+            unsafe {
+                libc::posix_fadvise(file.as_raw_fd(), 0, PREFETCH_LEN, libc::POSIX_FADV_WILLNEED);
+            }
+        }
+    }
+
+    #[cfg(not(target_os = "linux"))]
+    let _ = path;
+}
+
+/// Tell the kernel `file` will be read front to back, doubling its readahead
+/// window so fast consumers (hashing, copying) are not starved by small reads.
+///
+/// Best-effort and a no-op off Linux.
+pub fn advise_sequential(file: &File) {
+    #[cfg(target_os = "linux")]
+    {
+        use std::os::unix::io::AsRawFd;
+
+        unsafe {
+            libc::posix_fadvise(file.as_raw_fd(), 0, 0, libc::POSIX_FADV_SEQUENTIAL);
+        }
+    }
+
+    #[cfg(not(target_os = "linux"))]
+    let _ = file;
+}
+
+/// Drop `file`'s pages from the page cache once they have been consumed.
+///
+/// Used after reading a file exactly once (e.g. hashing) so large scans do
+/// not evict the rest of the cache. Best-effort and a no-op off Linux.
+pub fn drop_page_cache(file: &File) {
+    #[cfg(target_os = "linux")]
+    {
+        use std::os::unix::io::AsRawFd;
+
+        unsafe {
+            libc::posix_fadvise(file.as_raw_fd(), 0, 0, libc::POSIX_FADV_DONTNEED);
+        }
+    }
+
+    #[cfg(not(target_os = "linux"))]
+    let _ = file;
+}
+
+/// Pin the calling thread to the `index`-th CPU it is allowed to run on
+/// (wrapping around), for use as a rayon `start_handler`.
+///
+/// Best-effort and a no-op off Linux.
+pub fn pin_current_thread(index: usize) {
+    #[cfg(target_os = "linux")]
+    unsafe {
+        let set_size = std::mem::size_of::<libc::cpu_set_t>();
+        let mut allowed: libc::cpu_set_t = std::mem::zeroed();
+        if libc::sched_getaffinity(0, set_size, &mut allowed) != 0 {
+            return;
+        }
+
+        let cpus: Vec<usize> = (0..libc::CPU_SETSIZE as usize)
+            .filter(|&cpu| libc::CPU_ISSET(cpu, &allowed))
+            .collect();
+        if cpus.is_empty() {
+            return;
+        }
+
+        let mut target: libc::cpu_set_t = std::mem::zeroed();
+        libc::CPU_SET(cpus[index % cpus.len()], &mut target);
+        libc::sched_setaffinity(0, set_size, &target);
+    }
+
+    #[cfg(not(target_os = "linux"))]
+    let _ = index;
+}
+
 /// Reusable filter for walking directories across features.
 pub struct WalkFilter {
     pub skip_hidden: bool,
@@ -1,3 +1,5 @@
+#[cfg(unix)]
+use std::os::unix::io::RawFd;
 use std::path::PathBuf;
 use std::sync::atomic::{AtomicBool, Ordering};
 use std::sync::Arc;
@@ -50,6 +52,8 @@ pub struct FileWatcher {
     receiver: Option<channel::Receiver<DebounceEventResult>>,
     debouncer: Option<Debouncer<notify::RecommendedWatcher, FileIdMap>>,
     running: Arc<AtomicBool>,
+    #[cfg(unix)]
+    event_fd: Option<Arc<EventFd>>,
 }
 
 #[pymethods]
@@ -67,7 +71,9 @@ impl FileWatcher {
             return Err(FsError::Watch(format!("path does not exist: {}", path)).into());
         }
 
-        let ignore_glob_set = if let Some(patterns) = ignore_patterns {
+        // Compiled once here; each event is then a single GlobSet match.
+        // An empty pattern list is treated like no patterns at all.
+        let ignore_glob_set = if let Some(patterns) = ignore_patterns.filter(|p| !p.is_empty()) {
             let mut builder = GlobSetBuilder::new();
             for pattern in &patterns {
                 let glob = Glob::new(pattern).map_err(|e| {
@@ -92,6 +98,8 @@ impl FileWatcher {
             receiver: None,
             debouncer: None,
             running: Arc::new(AtomicBool::new(false)),
+            #[cfg(unix)]
+            event_fd: None,
         })
     }
 
@@ -103,11 +111,27 @@ impl FileWatcher {
 
         let (sender, receiver) = channel::unbounded();
 
+        // Kept across stop()/start() so an fd registered with an event loop stays valid
+        #[cfg(unix)]
+        let event_fd = match &self.event_fd {
+            Some(fd) => Arc::clone(fd),
+            None => {
+                let fd =
+                    Arc::new(EventFd::new().map_err(|e| {
+                        FsError::Watch(format!("failed to create event fd: {}", e))
+                    })?);
+                self.event_fd = Some(Arc::clone(&fd));
+                fd
+            }
+        };
+
         let mut debouncer = new_debouncer(
             Duration::from_millis(self.debounce_ms),
             None,
             move |result: DebounceEventResult| {
                 let _ = sender.send(result);
+                #[cfg(unix)]
+                event_fd.signal();
             },
         )
         .map_err(|e| FsError::Watch(format!("failed to create watcher: {}", e)))?;
@@ -151,53 +175,54 @@ impl FileWatcher {
         let result = py.allow_threads(|| receiver.recv_timeout(Duration::from_millis(timeout_ms)));
 
         match result {
-            Ok(Ok(events)) => {
-                let now = std::time::SystemTime::now()
-                    .duration_since(std::time::UNIX_EPOCH)
-                    .unwrap_or_default()
-                    .as_secs_f64();
-
-                let mut changes = Vec::new();
-                for event in events {
-                    let change_type = match event.kind {
-                        notify::EventKind::Create(_) => "created",
-                        notify::EventKind::Modify(_) => "modified",
-                        notify::EventKind::Remove(_) => "deleted",
-                        _ => continue,
-                    };
-
-                    for path in &event.paths {
-                        // Apply ignore patterns
-                        if let Some(ref glob_set) = self.ignore_glob_set {
-                            if let Some(name) = path.file_name() {
-                                if glob_set.is_match(name) {
-                                    continue;
-                                }
-                            }
-                        }
-
-                        changes.push(FileChange {
-                            path: path.to_string_lossy().into_owned(),
-                            change_type: change_type.to_string(),
-                            is_dir: path.is_dir(),
-                            timestamp: now,
-                        });
-                    }
-                }
-
-                Ok(changes)
-            }
-            Ok(Err(errors)) => {
-                for e in &errors {
-                    log::warn!("watch error: {}", e);
-                }
-                Ok(Vec::new())
-            }
+            Ok(result) => Ok(self.to_changes(result)),
             Err(channel::RecvTimeoutError::Timeout) => Ok(Vec::new()),
             Err(channel::RecvTimeoutError::Disconnected) => Ok(Vec::new()),
         }
     }
 
+    /// File descriptor that becomes readable whenever events are pending.
+    ///
+    /// Register it with a selector or `loop.add_reader()` and call
+    /// `drain_events()` when it fires. Only available after `start()`, and
+    /// only on Unix.
+    fn event_fd(&self) -> PyResult<i32> {
+        #[cfg(unix)]
+        {
+            match &self.event_fd {
+                Some(fd) => Ok(fd.read_fd),
+                None => Err(FsError::Watch(
+                    "watcher has not been started; call start() first".to_string(),
+                )
+                .into()),
+            }
+        }
+        #[cfg(not(unix))]
+        {
+            Err(FsError::Watch("event_fd() is only available on Unix".to_string()).into())
+        }
+    }
+
+    /// Return all pending events without blocking and reset `event_fd()`.
+    fn drain_events(&self) -> Vec<FileChange> {
+        let receiver = match &self.receiver {
+            Some(r) => r,
+            None => return Vec::new(),
+        };
+
+        // Clear before draining: a batch queued after this point re-arms the fd
+        #[cfg(unix)]
+        if let Some(fd) = &self.event_fd {
+            fd.clear();
+        }
+
+        let mut changes = Vec::new();
+        while let Ok(result) = receiver.try_recv() {
+            changes.extend(self.to_changes(result));
+        }
+        changes
+    }
+
     fn __enter__(mut slf: PyRefMut<Self>) -> PyResult<PyRefMut<Self>> {
         slf.start()?;
         Ok(slf)
@@ -232,6 +257,140 @@ impl FileWatcher {
     }
 }
 
+impl FileWatcher {
+    /// Convert one debouncer batch into FileChange objects, applying ignore patterns.
+    fn to_changes(&self, result: DebounceEventResult) -> Vec<FileChange> {
+        let events = match result {
+            Ok(events) => events,
+            Err(errors) => {
+                for e in &errors {
+                    log::warn!("watch error: {}", e);
+                }
+                return Vec::new();
+            }
+        };
+
+        let now = std::time::SystemTime::now()
+            .duration_since(std::time::UNIX_EPOCH)
+            .unwrap_or_default()
+            .as_secs_f64();
+
+        let mut changes = Vec::new();
+        for event in events {
+            let change_type = match event.kind {
+                notify::EventKind::Create(_) => "created",
+                notify::EventKind::Modify(_) => "modified",
+                notify::EventKind::Remove(_) => "deleted",
+                _ => continue,
+            };
+
+            for path in &event.paths {
+                // Apply ignore patterns
+                if let Some(ref glob_set) = self.ignore_glob_set {
+                    if let Some(name) = path.file_name() {
+                        if glob_set.is_match(name) {
+                            continue;
+                        }
+                    }
+                }
+
+                changes.push(FileChange {
+                    path: path.to_string_lossy().into_owned(),
+                    change_type: change_type.to_string(),
+                    is_dir: path.is_dir(),
+                    timestamp: now,
+                });
+            }
+        }
+
+        changes
+    }
+}
+
+/// Readiness fd signalled by the debouncer thread each time a batch is queued.
+///
+/// An eventfd on Linux; a non-blocking self-pipe on other Unix systems.
+#[cfg(unix)]
+struct EventFd {
+    read_fd: RawFd,
+    write_fd: RawFd,
+}
+
+#[cfg(unix)]
+impl EventFd {
+    #[cfg(target_os = "linux")]
+    fn new() -> std::io::Result<Self> {
+        let fd = unsafe { libc::eventfd(0, libc::EFD_NONBLOCK | libc::EFD_CLOEXEC) };
+        if fd < 0 {
+            return Err(std::io::Error::last_os_error());
+        }
+        Ok(EventFd {
+            read_fd: fd,
+            write_fd: fd,
+        })
+    }
+
+    #[cfg(not(target_os = "linux"))]
+    fn new() -> std::io::Result<Self> {
+        let mut fds = [0 as RawFd; 2];
+        if unsafe { libc::pipe(fds.as_mut_ptr()) } < 0 {
+            return Err(std::io::Error::last_os_error());
+        }
+        for fd in fds {
+            unsafe {
+                libc::fcntl(fd, libc::F_SETFL, libc::O_NONBLOCK);
+                libc::fcntl(fd, libc::F_SETFD, libc::FD_CLOEXEC);
+            }
+        }
+        Ok(EventFd {
+            read_fd: fds[0],
+            write_fd: fds[1],
+        })
+    }
+
+    fn signal(&self) {
+        // eventfd requires an 8-byte write; a full pipe is already readable,
+        // so EAGAIN can be ignored either way.
+        let one: u64 = 1;
+        unsafe {
+            libc::write(
+                self.write_fd,
+                &one as *const u64 as *const libc::c_void,
+                std::mem::size_of::<u64>(),
+            );
+        }
+    }
+
+    fn clear(&self) {
+        // One read resets an eventfd counter; a pipe is read until empty.
+        let mut buf = [0u8; 64];
+        loop {
+            let n = unsafe {
+                libc::read(
+                    self.read_fd,
+                    buf.as_mut_ptr() as *mut libc::c_void,
+                    buf.len(),
+                )
+            };
+            if n < buf.len() as isize {
+                break;
+            }
+        }
+    }
+}
+
+#[cfg(unix)]
+impl Drop for EventFd {
+    fn drop(&mut self) {
+        unsafe {
+            libc::close(self.read_fd);
+            if self.write_fd != self.read_fd {
+                libc::close(self.write_fd);
+            }
+        }
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -247,4 +406,23 @@ mod tests {
         assert!(set.is_match("error.log"));
         assert!(!set.is_match("data.txt"));
     }
+
+    #[cfg(unix)]
+    #[test]
+    fn test_event_fd_signal_and_clear() {
+        let fd = EventFd::new().unwrap();
+        let mut pfd = libc::pollfd {
+            fd: fd.read_fd,
+            events: libc::POLLIN,
+            revents: 0,
+        };
+        let readable = |pfd: &mut libc::pollfd| unsafe { libc::poll(pfd, 1, 0) } == 1;
+
+        assert!(!readable(&mut pfd));
+        fd.signal();
+        fd.signal();
+        assert!(readable(&mut pfd));
+        fd.clear();
+        assert!(!readable(&mut pfd));
+    }
 }
@@ -1,3 +1,4 @@
+import sys
 from pathlib import Path
 
 import pyfs_watcher
@@ -60,6 +61,85 @@ def test_copy_overwrite_true(tmp_path):
     assert dst.read_text() == "new content"
 
 
+def test_copy_overwrite_longer_destination(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("short")
+    dst = tmp_path / "dst.txt"
+    dst.write_text("much longer existing content")
+
+    pyfs_watcher.copy_files([str(src)], str(dst), overwrite=True)
+    assert dst.read_text() == "short"
+
+
+def test_copy_overwrite_failure_leaves_no_stale_tail(tmp_path):
+    src = tmp_path / "src.bin"
+    data = b"n" * (4 * 1024 * 1024)
+    src.write_bytes(data)
+    dst = tmp_path / "dst.bin"
+    dst.write_bytes(b"o" * (8 * 1024 * 1024))
+
+    def fail(_progress: object) -> None:
+        raise RuntimeError("stop")
+
+    with pytest.raises(RuntimeError, match="stop"):
+        pyfs_watcher.copy_files(
+            [str(src)],
+            str(dst),
+            overwrite=True,
+            method="userspace",
+            progress_callback=fail,
+            callback_interval_ms=0,
+        )
+    # Only the bytes written before the failure remain, none of the old file
+    written = dst.read_bytes()
+    assert len(written) < len(data)
+    assert written == data[: len(written)]
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="kernel copy paths are Linux-only")
+@pytest.mark.parametrize("method", ["auto", "copy_file_range", "sendfile", "splice", "userspace"])
+def test_copy_methods(tmp_path, method):
+    src = tmp_path / "big.bin"
+    data = bytes(range(256)) * 40_000
+    src.write_bytes(data)
+    dst = tmp_path / "dest"
+    dst.mkdir()
+
+    result = pyfs_watcher.copy_files([str(src)], str(dst), method=method)
+    assert Path(result[0]).read_bytes() == data
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="reflink is Linux-only")
+def test_copy_reflink(tmp_path):
+    src = tmp_path / "src.bin"
+    data = b"reflink" * 1000
+    src.write_bytes(data)
+    dst = tmp_path / "dst.bin"
+
+    # Only filesystems with shared extents (btrfs, xfs, ...) support FICLONE.
+    try:
+        pyfs_watcher.copy_files([str(src)], str(dst), method="reflink")
+    except CopyError as e:
+        assert "reflink" in str(e)
+    else:
+        assert dst.read_bytes() == data
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="procfs is Linux-only")
+def test_copy_zero_size_pseudo_file(tmp_path):
+    # /proc files report st_size == 0 but have content
+    dst = tmp_path / "status"
+    pyfs_watcher.copy_files(["/proc/self/status"], str(dst), preserve_metadata=False)
+    assert dst.read_text().startswith("Name:")
+
+
+def test_copy_invalid_method(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("data")
+    with pytest.raises(CopyError, match="copy method"):
+        pyfs_watcher.copy_files([str(src)], str(tmp_path / "dst.txt"), method="bogus")  # type: ignore[arg-type]
+
+
 def test_copy_nonexistent_source(tmp_path):
     with pytest.raises(CopyError):
         pyfs_watcher.copy_files(["/nonexistent/file.txt"], str(tmp_path))
@@ -82,6 +162,7 @@ def test_copy_with_progress(tmp_path):
     last = progress_updates[-1]
     assert last.total_files == 1
     assert last.files_completed == 1
+    assert sum(last.method_breakdown.values()) == 1
 
 
 def test_move_file(tmp_path):
@@ -1,4 +1,9 @@
+import sys
+from pathlib import Path
+
 import pyfs_watcher
+import pytest
+from pyfs_watcher.errors import CopyError
 
 
 def test_find_duplicates(duplicate_tree):
@@ -27,6 +32,19 @@ def test_find_duplicates_no_dups(tmp_path):
     assert len(groups) == 0
 
 
+def test_find_duplicates_same_head_and_tail(tmp_path):
+    # Identical first/last 4 KiB but different middles: the partial hashes
+    # collide, the full hashes must not.
+    head, tail = b"h" * 4096, b"t" * 4096
+    for name, middle in [("a1", b"x"), ("a2", b"x"), ("b", b"y")]:
+        (tmp_path / f"{name}.bin").write_bytes(head + middle * 2000 + tail)
+
+    for partial_hash_size in (1024, 4096):
+        groups = pyfs_watcher.find_duplicates([str(tmp_path)], partial_hash_size=partial_hash_size)
+        assert len(groups) == 1
+        assert sorted(Path(p).name for p in groups[0].paths) == ["a1.bin", "a2.bin"]
+
+
 def test_find_duplicates_min_size(duplicate_tree):
     # All files are 10000 or 5000 bytes. Setting min_size=10001 should exclude everything.
     groups = pyfs_watcher.find_duplicates([str(duplicate_tree)], min_size=10001)
@@ -40,11 +58,34 @@ def test_find_duplicates_with_progress(duplicate_tree):
         progress_callback=lambda stage, done, total: stages.append(stage),
     )
     assert "size_grouping" in stages
+    assert "extent_probe" in stages
     assert "partial_hash" in stages
     assert "full_hash" in stages
     assert len(groups) > 0
 
 
+def test_find_duplicates_sharing(duplicate_tree):
+    # Plain copies written independently never share extents
+    groups = pyfs_watcher.find_duplicates([str(duplicate_tree)])
+    assert all(g.sharing == "none" for g in groups)
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="extent probing is Linux-only")
+def test_find_duplicates_reflink_cluster(tmp_path):
+    src = tmp_path / "original.bin"
+    src.write_bytes(b"r" * 100_000)
+    clone = tmp_path / "clone.bin"
+    try:
+        pyfs_watcher.copy_files([str(src)], str(clone), method="reflink")
+    except CopyError:
+        pytest.skip("filesystem does not support reflinks")
+
+    groups = pyfs_watcher.find_duplicates([str(tmp_path)])
+    assert len(groups) == 1
+    assert groups[0].sharing == "reflink"
+    assert sorted(Path(p).name for p in groups[0].paths) == ["clone.bin", "original.bin"]
+
+
 def test_find_duplicates_sha256(duplicate_tree):
     groups = pyfs_watcher.find_duplicates([str(duplicate_tree)], algorithm="sha256")
     assert len(groups) == 2
@@ -1,3 +1,4 @@
+import array
 import hashlib
 
 import pyfs_watcher
@@ -59,6 +60,39 @@ def test_hash_files_parallel(tmp_path):
     assert len(set(hashes)) == 10
 
 
+def test_hash_files_mmap_rayon(tmp_path):
+    paths = []
+    for i in range(3):
+        f = tmp_path / f"large_{i}.bin"
+        f.write_bytes(bytes([i]) * (5 * 1024 * 1024))
+        paths.append(str(f))
+
+    regular = {r.path: r.hash_hex for r in pyfs_watcher.hash_files(paths)}
+    parallel = {r.path: r.hash_hex for r in pyfs_watcher.hash_files(paths, mmap_rayon=True)}
+    assert parallel == regular
+
+
+def test_hash_files_pin_cores(tmp_path):
+    paths = []
+    for i in range(4):
+        f = tmp_path / f"file_{i}.bin"
+        f.write_bytes(bytes([i]) * 1000)
+        paths.append(str(f))
+
+    regular = {r.path: r.hash_hex for r in pyfs_watcher.hash_files(paths)}
+    pinned = {r.path: r.hash_hex for r in pyfs_watcher.hash_files(paths, pin_cores=True)}
+    assert pinned == regular
+
+
+def test_hash_files_drop_cache(tmp_path):
+    f = tmp_path / "large.bin"
+    f.write_bytes(b"x" * (5 * 1024 * 1024))
+
+    regular = pyfs_watcher.hash_files([str(f)])
+    dropped = pyfs_watcher.hash_files([str(f)], drop_cache=True)
+    assert [r.hash_hex for r in dropped] == [r.hash_hex for r in regular]
+
+
 def test_hash_files_with_callback(tmp_path):
     paths = []
     for i in range(5):
@@ -75,6 +109,62 @@ def test_hash_files_with_callback(tmp_path):
     assert len(callback_results) == 5
 
 
+def test_hash_files_into(tmp_path):
+    paths = []
+    for i in range(5):
+        f = tmp_path / f"file_{i}.txt"
+        f.write_text(f"content {i}")
+        paths.append(str(f))
+
+    out = bytearray(len(paths) * 32)
+    failed = pyfs_watcher.hash_files_into(paths, out, algorithm="sha256")
+    assert failed == []
+    for i, p in enumerate(paths):
+        with open(p, "rb") as fh:
+            assert out[i * 32 : (i + 1) * 32] == hashlib.sha256(fh.read()).digest()
+
+
+def test_hash_files_into_sizes(tmp_path):
+    f = tmp_path / "ok.txt"
+    f.write_bytes(b"x" * 1234)
+    out = bytearray(64)
+    out_sizes = bytearray(16)
+    failed = pyfs_watcher.hash_files_into(
+        [str(f), "/nonexistent/file.txt"], out, out_sizes=out_sizes
+    )
+    assert failed == [1]
+    assert array.array("q", out_sizes).tolist() == [1234, 0]
+
+
+def test_hash_files_into_sizes_buffer_too_small(tmp_path):
+    f = tmp_path / "ok.txt"
+    f.write_text("data")
+    with pytest.raises(HashError, match="size buffer too small"):
+        pyfs_watcher.hash_files_into([str(f)], bytearray(32), out_sizes=bytearray(4))
+
+
+def test_hash_files_into_reports_failures(tmp_path):
+    f = tmp_path / "ok.txt"
+    f.write_text("data")
+    out = bytearray(64)
+    failed = pyfs_watcher.hash_files_into([str(f), "/nonexistent/file.txt"], out)
+    assert failed == [1]
+    assert out[32:] == bytes(32)
+
+
+def test_hash_files_into_buffer_too_small(tmp_path):
+    f = tmp_path / "ok.txt"
+    f.write_text("data")
+    with pytest.raises(HashError, match="too small"):
+        pyfs_watcher.hash_files_into([str(f)], bytearray(16))
+
+
+def test_cpu_features():
+    features = pyfs_watcher.cpu_features()
+    assert isinstance(features, list)
+    assert all(isinstance(f, str) for f in features)
+
+
 def test_hash_result_repr(tmp_path):
     f = tmp_path / "test.txt"
     f.write_text("data")
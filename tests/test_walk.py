@@ -1,6 +1,8 @@
 import os
+import sys
 
 import pyfs_watcher
+import pytest
 from pyfs_watcher.errors import WalkError
 
 
@@ -26,6 +28,23 @@ def test_walk_collect_dirs_only(sample_tree):
     assert all(not e.is_file for e in entries)
 
 
+def test_walk_collect_columns(sample_tree):
+    paths, depths, sizes, flags = pyfs_watcher.walk_collect_columns(str(sample_tree), sort=True)
+    entries = pyfs_watcher.walk_collect(str(sample_tree), sort=True)
+    assert paths == [e.path for e in entries]
+    assert list(depths) == [e.depth for e in entries]
+    assert list(sizes) == [e.file_size for e in entries]
+    assert [bool(f & 1) for f in flags] == [e.is_dir for e in entries]
+    assert [bool(f & 2) for f in flags] == [e.is_file for e in entries]
+
+
+def test_walk_count(sample_tree):
+    assert pyfs_watcher.walk_count(str(sample_tree), file_type="file") == 20
+    assert pyfs_watcher.walk_count(str(sample_tree)) == len(
+        pyfs_watcher.walk_collect(str(sample_tree))
+    )
+
+
 def test_walk_max_depth(sample_tree):
     entries = pyfs_watcher.walk_collect(str(sample_tree), max_depth=1)
     assert all(e.depth <= 1 for e in entries)
@@ -56,6 +75,26 @@ def test_walk_iterator(sample_tree):
     assert count == 20
 
 
+def test_walk_batches(sample_tree):
+    """Test the batched walk_batches() iterator."""
+    batches = list(pyfs_watcher.walk_batches(str(sample_tree), batch=8, file_type="file"))
+    assert [len(b) for b in batches] == [8, 8, 4]
+    paths = {e.path for b in batches for e in b}
+    expected = {e.path for e in pyfs_watcher.walk_collect(str(sample_tree), file_type="file")}
+    assert paths == expected
+
+
+def test_walk_batches_huge_batch(sample_tree):
+    """A batch larger than the walk yields everything in one list."""
+    batches = list(pyfs_watcher.walk_batches(str(sample_tree), batch=sys.maxsize, file_type="file"))
+    assert [len(b) for b in batches] == [20]
+
+
+def test_walk_batches_zero_batch(sample_tree):
+    with pytest.raises(WalkError):
+        pyfs_watcher.walk_batches(str(sample_tree), batch=0)
+
+
 def test_walk_matches_os_walk(sample_tree):
     """Verify walk_collect finds the same files as os.walk."""
     os_files = set()
@@ -1,9 +1,13 @@
+import asyncio
+import select
+import sys
 import threading
 import time
 
 import pyfs_watcher
 import pytest
 from pyfs_watcher.errors import WatchError
+from pyfs_watcher.types import FileChange
 
 
 def test_watcher_context_manager(tmp_path):
@@ -102,6 +106,13 @@ def test_watcher_ignore_patterns(tmp_path):
         watcher.stop()
 
 
+def test_watcher_ignore_patterns_accepts_any_sequence(tmp_path):
+    for patterns in (("*.tmp", "*.log"), ["*.tmp"], []):
+        watcher = pyfs_watcher.FileWatcher(str(tmp_path), ignore_patterns=patterns)
+        watcher.start()
+        watcher.stop()
+
+
 def test_file_change_repr(tmp_path):
     watcher = pyfs_watcher.FileWatcher(str(tmp_path), debounce_ms=100)
     watcher.start()
@@ -117,3 +128,41 @@ def test_file_change_repr(tmp_path):
                 break
     finally:
         watcher.stop()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="event_fd is Unix-only")
+def test_watcher_event_fd(tmp_path):
+    watcher = pyfs_watcher.FileWatcher(str(tmp_path), debounce_ms=100)
+    with pytest.raises(WatchError):
+        watcher.event_fd()
+
+    watcher.start()
+    try:
+        fd = watcher.event_fd()
+        (tmp_path / "signalled.txt").write_text("data")
+
+        readable, _, _ = select.select([fd], [], [], 3.0)
+        assert readable == [fd]
+        assert len(watcher.drain_events()) > 0
+
+        # Drained: the fd is no longer readable and nothing is pending
+        readable, _, _ = select.select([fd], [], [], 0)
+        assert readable == []
+        assert watcher.drain_events() == []
+    finally:
+        watcher.stop()
+
+
+def test_async_watch_receives_events(tmp_path):
+    async def first_batch() -> list[FileChange]:
+        gen = pyfs_watcher.async_watch(str(tmp_path), debounce_ms=100)
+        try:
+            task = asyncio.ensure_future(gen.__anext__())
+            await asyncio.sleep(0.2)
+            (tmp_path / "async.txt").write_text("data")
+            return await asyncio.wait_for(task, timeout=5.0)
+        finally:
+            await gen.aclose()
+
+    changes = asyncio.run(first_batch())
+    assert any("async.txt" in c.path for c in changes)